@@ -59,7 +59,13 @@ def color(party_name_or_nickname: Optional[str]) -> Optional[str]:
         For example:
             color("Tory") -> '#0087DC'
     """
-    official_name = names.official(party_name_or_nickname)
+    official_name = None
+    if isinstance(party_name_or_nickname, str):
+        # Exact hit first: most callers pass a canonical name, and
+        # this skips the fuzzy-matching machinery entirely.
+        official_name = names.exact_official(party_name_or_nickname.strip())
+    if official_name is None:
+        official_name = names.official(party_name_or_nickname)
     return colors.by_official_party_name(official_name)
 
 
@@ -83,7 +89,12 @@ def find_party(nickname: Optional[str], return_short_name: bool = False, allow_f
     Returns:
         name (str): The official name of the party best matching the nickname.
     """
-    official_name = names.official(nickname, allow_fuzzy_match=allow_fuzzy)
+    official_name = None
+    if isinstance(nickname, str):
+        # Exact hit first, before any fuzzy-matching setup.
+        official_name = names.exact_official(nickname.strip())
+    if official_name is None:
+        official_name = names.official(nickname, allow_fuzzy_match=allow_fuzzy)
 
     if return_short_name:
         return names.short(official_name)
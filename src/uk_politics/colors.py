@@ -8,8 +8,9 @@ that someone will want to use our module to find a suitable color.
 The historic color is supplied, along with a warning.
 """
 
-from typing import Optional
+import sys
 import warnings
+from typing import Optional
 from . import data_tables
 from . import exceptions
 
@@ -36,6 +37,9 @@ def by_official_party_name(party_name: Optional[str]) -> Optional[str]:
     if party_name is None:
         return None
 
+    # The color table keys are interned, so interning the probe
+    # lets the dict lookup compare by pointer.
+    party_name = sys.intern(party_name)
     if party_name in data_tables.PARTY_COLORS:
         if party_name == "Green Party":
             warnings.warn(("The Green Party has split into different chapters"
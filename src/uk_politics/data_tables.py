@@ -1,11 +1,18 @@
 """Functions for importing data."""
 import os
 import csv
-from typing import Dict, Tuple
+import pickle
+import sys
+from typing import Callable, Dict, Iterator, List, Tuple, TypeVar
 import pandas as pd
 
 from . import exceptions
 
+_T = TypeVar("_T")
+
+_CACHE_VERSION = 4
+"""Bump this whenever the shape of cached objects changes."""
+
 
 def data_path(filename: str) -> str:
     """Get full path to a file in the data folder.
@@ -36,6 +43,46 @@ def test_data_file(short_name: str) -> None:
         raise exceptions.DataFileMissingOrUnreadable(short_name)
 
 
+def read_cached(short_name: str, builder: Callable[[], _T]) -> _T:
+    """Build data from a file, caching the result in a pickle sidecar.
+
+    Parsing the large data files dominates import time,
+    so the built objects are pickled next to the source file
+    and reloaded directly while the source is unchanged
+    (checked by modification time). The cache is best-effort:
+    if the sidecar cannot be read or written (for example in a
+    read-only install) the data is simply rebuilt from source.
+
+    Args:
+        short_name (str): Name of the source data file.
+        builder (Callable): Zero-argument function that builds
+            the objects from the source file.
+
+    Returns:
+        The builder's result, possibly loaded from cache.
+    """
+    source_path = data_path(short_name)
+    test_data_file(short_name)
+    sidecar_path = source_path + ".pickle"
+    try:
+        if os.path.getmtime(sidecar_path) >= os.path.getmtime(source_path):
+            with open(sidecar_path, "rb") as file:
+                version, payload = pickle.load(file)
+            if version == _CACHE_VERSION:
+                return payload
+    except Exception:  # pylint: disable=broad-except
+        # A stale or corrupt sidecar must never break the import;
+        # whatever went wrong, rebuild from source below.
+        pass
+    payload = builder()
+    try:
+        with open(sidecar_path, "wb") as file:
+            pickle.dump((_CACHE_VERSION, payload), file, protocol=5)
+    except OSError:
+        pass
+    return payload
+
+
 def read_csv_to_dict(short_name: str) -> Dict[str, str]:
     """Load csv into memory.
 
@@ -49,7 +96,10 @@ def read_csv_to_dict(short_name: str) -> Dict[str, str]:
     test_data_file(short_name)
     with open(path, "r", encoding="utf-8-sig") as file:
         csv_reader = csv.reader(file, delimiter=",")
-        mapping = {rows[0]: rows[1] for rows in csv_reader}
+        # Interned keys make the dict lookups in hot paths
+        # short-circuit on pointer equality.
+        mapping = {sys.intern(rows[0]): sys.intern(rows[1])
+                   for rows in csv_reader}
     return mapping
 
 
@@ -74,20 +124,46 @@ def read_nicknames_file(
     path = data_path(short_name)
     test_data_file(short_name)
     with open(path, "r", encoding="utf-8-sig") as file:
-        csv_reader = csv.reader(file, delimiter=",")
-        for row in csv_reader:
-            official = row[0].strip()
-            short = row[1].strip()
-            nicknames_to_official[short.lower()] = official
-            nicknames_to_official[official.lower()] = official
-            official_to_short_name[official.lower()] = short
+        # The nicknames file has no quoted or escaped fields,
+        # so a plain split is enough and skips the csv module's
+        # per-row dispatch.
+        for line in file:
+            row = line.rstrip("\n").split(",")
+            if len(row) < 2:
+                continue
+            official = sys.intern(row[0].strip())
+            short = sys.intern(row[1].strip())
+            nicknames_to_official[sys.intern(short.lower())] = official
+            nicknames_to_official[sys.intern(official.lower())] = official
+            official_to_short_name[sys.intern(official.lower())] = short
             for nickname in row[2:]:
-                nicknames_to_official[nickname.lower()] = official
+                nicknames_to_official[sys.intern(nickname.lower())] = official
     # Green Party, with its different chapters, needs to be set by hand
-    nicknames_to_official["green party"] = "Green Party"
+    nicknames_to_official[sys.intern("green party")] = sys.intern("Green Party")
     return nicknames_to_official, official_to_short_name
 
 
+def read_tsv_rows(short_name: str) -> Iterator[List[str]]:
+    """Iterate over the data rows of a tsv file, skipping the header.
+
+    Streams plain field lists straight from the csv module with
+    no intermediate DataFrame, which is all the election store
+    build needs.
+
+    Args:
+        short_name (str): Name of data file.
+
+    Yields:
+        row (List[str]): The fields of one data line.
+    """
+    path = data_path(short_name)
+    test_data_file(short_name)
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file, delimiter="\t")
+        next(reader, None)  # header
+        yield from reader
+
+
 def read_csv_to_dataframe(
     short_name: str,
     separator: str = ","
@@ -103,16 +179,44 @@ def read_csv_to_dataframe(
     """
     path = data_path(short_name)
     test_data_file(short_name)
-    dataframe = pd.read_csv(path, sep=separator)
+    try:
+        # Arrow's multi-threaded reader is much faster than the
+        # default parser on the results table; pyarrow is optional,
+        # so fall back when it is not installed.
+        dataframe = pd.read_csv(path, sep=separator, engine="pyarrow")
+    except ImportError:
+        dataframe = pd.read_csv(path, sep=separator)
     return dataframe
 
 
-PARTY_NICKNAMES, PARTY_SHORTNAMES = read_nicknames_file("party_nicknames.csv")
+PARTY_NICKNAMES: Dict[str, str]
 """Official names from the nicknames we have on record."""
 
-PARTY_COLORS = read_csv_to_dict("party_colors.csv")
+PARTY_SHORTNAMES: Dict[str, str]
+"""Short names for each official party name."""
+
+PARTY_COLORS: Dict[str, str]
 """Web color names for the parties."""
 
+
+def __getattr__(name: str):
+    """Load the party tables lazily on first access (PEP 562).
+
+    The tables are small but reading them still costs file I/O,
+    so they are only loaded when actually used and then stashed
+    in the module namespace for later accesses.
+    """
+    if name in ("PARTY_NICKNAMES", "PARTY_SHORTNAMES"):
+        nicknames, shortnames = read_nicknames_file("party_nicknames.csv")
+        globals()["PARTY_NICKNAMES"] = nicknames
+        globals()["PARTY_SHORTNAMES"] = shortnames
+        return globals()[name]
+    if name == "PARTY_COLORS":
+        colors = read_csv_to_dict("party_colors.csv")
+        globals()[name] = colors
+        return colors
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 """MIT License
 
 Copyright (c) 2021 Stonehaven
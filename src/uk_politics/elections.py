@@ -1,180 +1,422 @@
-r"""Election vote counts.
-
-Election results are stored as a VoteTotal object;
-one for each party / location / date combination.
-Speakers are assigned to the party "Speaker".
-"""
-import dataclasses
-import datetime
-from typing import Dict, List, Optional, Tuple
-
-from uk_politics import exceptions
-
-from . import data_tables
-from . import location
-from . import names
-
-
-@dataclasses.dataclass
-class VoteTotal:
-    """Vote total for a single party / location / date combination.
-
-    Attributes:
-        location (uk_politics.Location): Single constituency.
-        date (datetime.date): Date on which the election happened.
-        party (str): Official, current, name of the party.
-        party_contemporary_styling (str): Party as recorded in the data.
-        votes (int): Vote count for this party in this place on this day.
-
-    The property `.party` is always the modern official name for the party,
-    and `.party_contemporary_styling` is the
-    short form used in the election data.
-    For example some elections just write "PC" instead of
-    "Plaid Cymru - the Party of Wales", so we record both.
-    """
-
-    location: location.Location
-    date: datetime.date
-    party: str
-    party_contemporary_styling: str
-    votes: int
-
-
-def _vote_line_to_object(line: List[str]) -> VoteTotal:
-    """Convert a line in a tsv file to a VoteTotal object."""
-    count_location = location.from_raw_string(line[0])
-    party_contemporary_styling = line[2]
-    if party_contemporary_styling == "PC/SNP":
-        # These were lumped together in some elections
-        if count_location.country == "Scotland":
-            party_contemporary_styling = "SNP"
-        elif count_location.country == "Wales":
-            party_contemporary_styling = "PC"
-    elif party_contemporary_styling == "Green":
-        # Green party is officially distinct between these regions
-        # Use names.short to turn these all back into "Green Party"
-        if count_location.country == "Scotland":
-            party_contemporary_styling = "Scottish Green Party"
-        elif count_location.country == "Northern Ireland":
-            party_contemporary_styling = "Green Party Northern Ireland"
-        else:
-            party_contemporary_styling = "Green Party of England and Wales"
-
-    party_official_name = names.official(
-        party_contemporary_styling, warn_on_fuzzy_match=True)
-
-    if party_official_name is None:
-        raise exceptions.DataLineUnreadable(
-            "\t".join(line), "party name could not be read")
-
-    return VoteTotal(location=count_location,
-                     date=datetime.datetime.strptime(
-                         line[1], "%Y-%m-%d").date(),
-                     party=party_official_name,
-                     party_contemporary_styling=party_contemporary_styling,
-                     votes=int(line[3]))
-
-
-_ALL_VOTES_DF = data_tables.read_csv_to_dataframe("GE_results.tsv", "\t")
-
-COUNTS: List[VoteTotal] = [_vote_line_to_object(vote[1])
-                           for vote in _ALL_VOTES_DF.iterrows()]
-"""A list of every party / date / location vote count."""
-
-PARTIES_ORIGINAL_NAMES: List[str] = sorted(
-    list({vote_count.party for vote_count in COUNTS}))
-"""A list of every party name as styled in the original data."""
-
-DATES: List[datetime.date] = sorted(
-    list({vote_count.date for vote_count in COUNTS}))
-"""The dates of the elections for which we have data."""
-
-MOST_RECENT_ELECTION_DATE: datetime.date = max(DATES)
-"""The date of the most recent election in the data."""
-
-
-def seats(date: datetime.date = MOST_RECENT_ELECTION_DATE,
-          location_filter: Optional[location.Location] = None
-          ) -> List[Tuple[location.Location, str]]:
-    """List the constituencies along with the name of the party that won.
-
-    The Speaker is treated as their own party.
-    See politics.elections.DATES for a list of dates.
-
-    Args:
-        date (datetime.date, optional):
-            The date of the election to inspect.
-            Defaults to MOST_RECENT_ELECTION_DATE.
-
-    Returns:
-        A list of tuples (List[Tuple[location.Location, str]]):
-            Location
-            Winning party
-    """
-    if location_filter is None:
-        location_filter = location.Location()
-    counts_for_this_date = [count for count in COUNTS
-                            if location_filter >= count.location
-                            if count.date == date]
-    locations = {count.location for count in counts_for_this_date}
-    constituency_winners: Dict[location.Location, str] = {}
-    for loc in locations:
-        party_counts = {count.party: count.votes
-                        for count in counts_for_this_date
-                        if count.location == loc}
-        winner = max(party_counts.keys(), key=lambda x,
-                     counter=party_counts: counter[x])
-        constituency_winners[loc] = winner
-    return list(constituency_winners.items())
-
-
-def ran(
-    date: datetime.date = MOST_RECENT_ELECTION_DATE,
-    location_filter: Optional[location.Location] = None,
-) -> List[str]:
-    """Parties that ran on the given date in the given location.
-
-    Leave location_filter as None to cover all locations.
-
-    Args:
-        date (datetime.date, optional):
-            Date of election to inspect.
-            Defaults to MOST_RECENT_ELECTION_DATE.
-        location_filter (location.Location, optional):
-            Only show parties that ran in locations within location_filter.
-            Defaults to None (most general).
-
-    Returns:
-        List of parties (List[str])
-    """
-    if location_filter is None:
-        parties = {count.party for count in COUNTS
-                   if date == count.date}
-    else:
-        parties = {count.party for count in COUNTS
-                   if location_filter >= count.location
-                   if date == count.date}
-    return sorted(list(parties))
-
-"""MIT License
-
-Copyright (c) 2021 Stonehaven
-
-Permission is hereby granted, free of charge, to any person obtaining a copy
-of this software and associated documentation files (the "Software"), to deal
-in the Software without restriction, including without limitation the rights
-to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
-copies of the Software, and to permit persons to whom the Software is
-furnished to do so, subject to the following conditions:
-
-The above copyright notice and this permission notice shall be included in all
-copies or substantial portions of the Software.
-
-THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-SOFTWARE.
+r"""Election vote counts.
+
+Election results are stored as a VoteTotal object;
+one for each party / location / date combination.
+Speakers are assigned to the party "Speaker".
+"""
+import dataclasses
+import datetime
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from uk_politics import exceptions
+
+from . import data_tables
+from . import location
+from . import names
+
+
+@dataclasses.dataclass
+class VoteTotal:
+    """Vote total for a single party / location / date combination.
+
+    Attributes:
+        location (uk_politics.Location): Single constituency.
+        date (datetime.date): Date on which the election happened.
+        party (str): Official, current, name of the party.
+        party_contemporary_styling (str): Party as recorded in the data.
+        votes (int): Vote count for this party in this place on this day.
+
+    The property `.party` is always the modern official name for the party,
+    and `.party_contemporary_styling` is the
+    short form used in the election data.
+    For example some elections just write "PC" instead of
+    "Plaid Cymru - the Party of Wales", so we record both.
+    """
+
+    location: location.Location
+    date: datetime.date
+    party: str
+    party_contemporary_styling: str
+    votes: int
+
+
+@dataclasses.dataclass
+class _Store:
+    """Column-wise (structure-of-arrays) election result storage.
+
+    Each row of the results file becomes one entry in the parallel
+    code arrays; the unique locations, parties, stylings, and dates
+    live once each in the lookup lists. Filters over the data can
+    then run as NumPy mask operations over small integer arrays
+    instead of touching one Python object per row.
+
+    Attributes:
+        loc_codes (np.ndarray): Per-row index into `locations`.
+        date_codes (np.ndarray): Per-row index into `date_values`.
+        party_codes (np.ndarray): Per-row index into `parties`.
+        styling_codes (np.ndarray): Per-row index into `stylings`.
+        votes (np.ndarray): Per-row vote count.
+        locations (List[uk_politics.Location]): Unique locations.
+        date_values (List[datetime.date]): Unique election dates.
+        parties (List[str]): Unique official party names.
+        stylings (List[str]): Unique contemporary party stylings.
+    """
+
+    loc_codes: np.ndarray
+    date_codes: np.ndarray
+    party_codes: np.ndarray
+    styling_codes: np.ndarray
+    votes: np.ndarray
+    locations: List[location.Location]
+    date_values: List[datetime.date]
+    parties: List[str]
+    stylings: List[str]
+
+
+def _disambiguate_styling(styling: str, country: Optional[str]) -> str:
+    """Resolve stylings whose meaning depends on the country."""
+    if styling == "PC/SNP":
+        # These were lumped together in some elections
+        if country == "Scotland":
+            return "SNP"
+        if country == "Wales":
+            return "PC"
+    elif styling == "Green":
+        # Green party is officially distinct between these regions
+        # Use names.short to turn these all back into "Green Party"
+        if country == "Scotland":
+            return "Scottish Green Party"
+        if country == "Northern Ireland":
+            return "Green Party Northern Ireland"
+        return "Green Party of England and Wales"
+    return styling
+
+
+def _load_store() -> _Store:
+    """Read the election results file and build the columnar store.
+
+    The rows stream straight from the csv module — the table is
+    only ever torn apart into columns, so there is nothing to
+    gain from building a DataFrame first. Each unique location,
+    date, and styling string is resolved exactly once and every
+    row just records its code.
+
+    Raises:
+        exceptions.DataLineUnreadable: If a party name cannot be resolved.
+
+    Returns:
+        store (_Store): The results in structure-of-arrays form.
+    """
+    loc_code_for_raw: Dict[str, int] = {}
+    date_code_for_raw: Dict[str, int] = {}
+    styling_code_for_raw: Dict[str, int] = {}
+    locations: List[location.Location] = []
+    date_values: List[datetime.date] = []
+    stylings: List[str] = []
+    first_row_for_styling: List[List[str]] = []
+    loc_codes: List[int] = []
+    date_codes: List[int] = []
+    styling_codes: List[int] = []
+    votes: List[int] = []
+
+    for row in data_tables.read_tsv_rows("GE_results.tsv"):
+        loc_code = loc_code_for_raw.get(row[0])
+        if loc_code is None:
+            loc_code = len(locations)
+            loc_code_for_raw[row[0]] = loc_code
+            locations.append(location.from_raw_string(row[0]))
+        loc_codes.append(loc_code)
+
+        date_code = date_code_for_raw.get(row[1])
+        if date_code is None:
+            date_code = len(date_values)
+            date_code_for_raw[row[1]] = date_code
+            date_values.append(datetime.date(
+                int(row[1][0:4]), int(row[1][5:7]), int(row[1][8:10])))
+        date_codes.append(date_code)
+
+        styling = _disambiguate_styling(row[2], locations[loc_code].country)
+        styling_code = styling_code_for_raw.get(styling)
+        if styling_code is None:
+            styling_code = len(stylings)
+            styling_code_for_raw[styling] = styling_code
+            stylings.append(sys.intern(styling))
+            first_row_for_styling.append(row)
+        styling_codes.append(styling_code)
+
+        votes.append(int(row[3]))
+
+    # One names.official call per unique styling, not per row:
+    # fuzzy matching is far too expensive to repeat thousands of
+    # times for the same few dozen strings.
+    party_for_styling = [names.official(styling, warn_on_fuzzy_match=True)
+                         for styling in stylings]
+    for code, party in enumerate(party_for_styling):
+        if party is None:
+            raise exceptions.DataLineUnreadable(
+                "\t".join(first_row_for_styling[code]),
+                "party name could not be read")
+    unique_parties, styling_to_party = np.unique(
+        party_for_styling, return_inverse=True)
+    party_codes = styling_to_party[np.array(styling_codes, dtype=np.int16)]
+
+    return _Store(loc_codes=np.array(loc_codes, dtype=np.int32),
+                  date_codes=np.array(date_codes, dtype=np.int16),
+                  party_codes=party_codes.astype(np.int16),
+                  styling_codes=np.array(styling_codes, dtype=np.int16),
+                  votes=np.array(votes, dtype=np.int32),
+                  locations=locations,
+                  date_values=date_values,
+                  parties=[str(party) for party in unique_parties],
+                  stylings=stylings)
+
+
+COUNTS: List[VoteTotal]
+"""A list of every party / date / location vote count."""
+
+PARTIES_ORIGINAL_NAMES: List[str]
+"""A list of every party name as styled in the original data."""
+
+DATES: List[datetime.date]
+"""The dates of the elections for which we have data."""
+
+MOST_RECENT_ELECTION_DATE: datetime.date
+"""The date of the most recent election in the data."""
+
+
+_STORE: Optional[_Store] = None
+
+
+def _store() -> _Store:
+    """Return the columnar store, loading it on first use."""
+    global _STORE
+    if _STORE is None:
+        _STORE = data_tables.read_cached("GE_results.tsv", _load_store)
+        # Re-intern after a cache load: unpickling produces fresh
+        # string objects, and interned names make the set and dict
+        # operations downstream pointer-compare.
+        _STORE.parties = list(map(sys.intern, _STORE.parties))
+        _STORE.stylings = list(map(sys.intern, _STORE.stylings))
+    return _STORE
+
+
+def _counts() -> List[VoteTotal]:
+    """Return COUNTS, materializing it from the store on first use."""
+    try:
+        return globals()["COUNTS"]
+    except KeyError:
+        store = _store()
+        counts = [VoteTotal(store.locations[loc],
+                            store.date_values[date],
+                            store.parties[party],
+                            store.stylings[styling],
+                            int(votes))
+                  for loc, date, party, styling, votes
+                  in zip(store.loc_codes, store.date_codes,
+                         store.party_codes, store.styling_codes,
+                         store.votes)]
+        globals()["COUNTS"] = counts
+        return counts
+
+
+def _dates() -> List[datetime.date]:
+    """Return DATES, building it on first use."""
+    try:
+        return globals()["DATES"]
+    except KeyError:
+        dates = sorted(_store().date_values)
+        globals()["DATES"] = dates
+        return dates
+
+
+def _most_recent_date() -> datetime.date:
+    """Return MOST_RECENT_ELECTION_DATE, computing it on first use."""
+    try:
+        return globals()["MOST_RECENT_ELECTION_DATE"]
+    except KeyError:
+        most_recent = max(_dates())
+        globals()["MOST_RECENT_ELECTION_DATE"] = most_recent
+        return most_recent
+
+
+def __getattr__(name: str):
+    """Build the election data attributes lazily (PEP 562).
+
+    Loading and normalizing the results file is by far the most
+    expensive part of importing this package, and users who only
+    want names or colors never need it. The data attributes are
+    therefore only built on first access, then stashed in the
+    module namespace so later accesses are plain lookups.
+    """
+    if name == "COUNTS":
+        return _counts()
+    if name == "DATES":
+        return _dates()
+    if name == "MOST_RECENT_ELECTION_DATE":
+        return _most_recent_date()
+    if name == "PARTIES_ORIGINAL_NAMES":
+        parties = sorted(_store().parties)
+        globals()[name] = parties
+        return parties
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_ROWS_BY_DATE: Optional[Dict[int, np.ndarray]] = None
+_WINNERS_BY_DATE: Optional[
+    Dict[int, List[Tuple[location.Location, str]]]] = None
+
+
+def _rows_by_date() -> Dict[int, np.ndarray]:
+    """Inverted index mapping each date code to its row indices.
+
+    Built once so that date-filtered queries only touch the rows
+    of the requested election rather than scanning every row.
+    """
+    global _ROWS_BY_DATE
+    if _ROWS_BY_DATE is None:
+        store = _store()
+        _ROWS_BY_DATE = {code: np.nonzero(store.date_codes == code)[0]
+                         for code in range(len(store.date_values))}
+    return _ROWS_BY_DATE
+
+
+def _select_winners(store: _Store,
+                    rows: np.ndarray) -> List[Tuple[location.Location, str]]:
+    """Per-constituency winners among the given rows."""
+    loc_codes = store.loc_codes[rows]
+    if len(loc_codes) == 0:
+        return []
+    party_codes = store.party_codes[rows]
+    votes = store.votes[rows]
+    # Sort rows by (location, votes); the last row of each
+    # location group is then that constituency's winner. This is
+    # the NumPy equivalent of groupby("location")["votes"].idxmax()
+    # without paying for a DataFrame per call.
+    order = np.lexsort((votes, loc_codes))
+    loc_sorted = loc_codes[order]
+    group_ends = np.append(np.nonzero(np.diff(loc_sorted))[0],
+                           len(loc_sorted) - 1)
+    winner_codes = party_codes[order][group_ends]
+    return [(store.locations[loc], store.parties[party])
+            for loc, party in zip(loc_sorted[group_ends], winner_codes)]
+
+
+def _winners_by_date() -> Dict[int, List[Tuple[location.Location, str]]]:
+    """Precomputed constituency winners for every election date.
+
+    One winner per constituency per date is the natural shape of
+    a seats() answer, so it is computed once for all dates and
+    each call just slices (and possibly filters) the stored list.
+    """
+    global _WINNERS_BY_DATE
+    if _WINNERS_BY_DATE is None:
+        store = _store()
+        _WINNERS_BY_DATE = {code: _select_winners(store, rows)
+                            for code, rows in _rows_by_date().items()}
+    return _WINNERS_BY_DATE
+
+
+def _location_allowed(store: _Store,
+                      location_filter: location.Location) -> np.ndarray:
+    """Mask over the unique locations selecting those in location_filter.
+
+    The filter comparison only runs once per unique location;
+    broadcast the result over rows through the loc_codes array.
+    """
+    return np.fromiter((location_filter >= loc for loc in store.locations),
+                       dtype=bool, count=len(store.locations))
+
+
+def seats(date: Optional[datetime.date] = None,
+          location_filter: Optional[location.Location] = None
+          ) -> List[Tuple[location.Location, str]]:
+    """List the constituencies along with the name of the party that won.
+
+    The Speaker is treated as their own party.
+    See politics.elections.DATES for a list of dates.
+
+    Args:
+        date (datetime.date, optional):
+            The date of the election to inspect.
+            Defaults to MOST_RECENT_ELECTION_DATE.
+
+    Returns:
+        A list of tuples (List[Tuple[location.Location, str]]):
+            Location
+            Winning party
+    """
+    store = _store()
+    if date is None:
+        date = _most_recent_date()
+    try:
+        date_code = store.date_values.index(date)
+    except ValueError:
+        return []
+    winners = _winners_by_date()[date_code]
+    if location_filter is not None and not location_filter.is_wildcard():
+        # Every row of a constituency shares one Location, so
+        # filtering the winner list matches filtering the rows.
+        return [(loc, party) for loc, party in winners
+                if location_filter >= loc]
+    return list(winners)
+
+
+def ran(
+    date: Optional[datetime.date] = None,
+    location_filter: Optional[location.Location] = None,
+) -> List[str]:
+    """Parties that ran on the given date in the given location.
+
+    Leave location_filter as None to cover all locations.
+
+    Args:
+        date (datetime.date, optional):
+            Date of election to inspect.
+            Defaults to MOST_RECENT_ELECTION_DATE.
+        location_filter (location.Location, optional):
+            Only show parties that ran in locations within location_filter.
+            Defaults to None (most general).
+
+    Returns:
+        List of parties (List[str])
+    """
+    store = _store()
+    if date is None:
+        date = _most_recent_date()
+    try:
+        date_code = store.date_values.index(date)
+    except ValueError:
+        return []
+    rows = _rows_by_date()[date_code]
+    party_codes = store.party_codes[rows]
+    if location_filter is not None and not location_filter.is_wildcard():
+        keep = _location_allowed(store, location_filter)[store.loc_codes[rows]]
+        party_codes = party_codes[keep]
+    return sorted(store.parties[code]
+                  for code in np.unique(party_codes))
+
+"""MIT License
+
+Copyright (c) 2021 Stonehaven
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
 """
\ No newline at end of file
@@ -1,10 +1,11 @@
 r"""A container for (possibly wildcard) location data."""
 
 import dataclasses
-from typing import Any, List, Optional
+import sys
+from typing import Any, Dict, List, Optional
 
 
-@dataclasses.dataclass()
+@dataclasses.dataclass(frozen=True, slots=True)
 class Location:
     """Location specification.
 
@@ -14,6 +15,19 @@ class Location:
     so is best left as None.
     Comparisons are made as though lower case.
 
+    There is no difference between a Location object
+    and a location filter; but users are expected to
+    only ever create filters. Location objects are populated
+    from the data files on first use.
+
+    Instances are immutable: locations are hashed and compared
+    constantly when filtering election data, so the repr and hash
+    are computed once at construction rather than on every call.
+    Equality is the dataclass-generated field comparison,
+    including `electorate`; it will therefore not be stable
+    between years, since the electorate changes size. You may
+    want to instead compare ons_id or name.
+
     When comparing Locations:
         A >= B if A is more general than, or equal to, B.
     Note that this comparison only properly works when B
@@ -31,54 +45,48 @@ class Location:
         electorate: int
     """
 
+    ons_id: Optional[str] = None
     constituency: Optional[str] = None
     county: Optional[str] = None
     region: Optional[str] = None
     country: Optional[str] = None
-    ons_id: Optional[str] = None
     electorate: Optional[int] = None
-
-    def __init__(self,
-                 ons_id: Optional[str] = None,
-                 constituency: Optional[str] = None,
-                 county: Optional[str] = None,
-                 region: Optional[str] = None,
-                 country: Optional[str] = None,
-                 electorate: Optional[int] = None):
-        """Create a location filter.
-
-        There is no difference between a Location object
-        and a location filter; but users are expected to
-        only ever create filters. Location objects are populated
-        from the data files at import time.
-        """
-        self.ons_id = ons_id
-        self.constituency = constituency
-        self.county = county
-        self.region = region
-        self.country = country
-        self.electorate = electorate
-
-    def _contains_loc_as_raw_string(self, raw_string: str) -> bool:
-        """Compare self against a raw string.
-
-        None is treated as a wildcard.
-        Ignores the `electorate` attribute.
+    _repr: str = dataclasses.field(init=False, repr=False, compare=False)
+    _hash: int = dataclasses.field(init=False, repr=False, compare=False)
+    _key_lower: tuple = dataclasses.field(
+        init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Precompute the cached repr, hash, and comparison key."""
+        as_string = "|".join(
+            list(map(_wildcard_if_none, self._string_properties_list))
+            + [_wildcard_if_none(self.electorate)])
+        object.__setattr__(self, "_repr", as_string)
+        object.__setattr__(self, "_hash", hash(as_string))
+        object.__setattr__(self, "_key_lower", tuple(
+            None if prop is None else prop.lower()
+            for prop in self._string_properties_list))
+
+    def is_wildcard(self) -> bool:
+        """True if every (string) property is a wildcard.
+
+        A wildcard-all Location contains every other location,
+        so filtering with one is a no-op; callers can use this to
+        skip the per-location comparisons entirely.
         """
-        string_properties = raw_string.split("|")
-        for index, prop in enumerate(self._string_properties_list):
-            if prop is not None:
-                if prop.lower() != string_properties[index].lower():
-                    return False
-
-        return True
+        return all(prop is None for prop in self._string_properties_list)
 
     def __ge__(self, other: "Location") -> bool:
         """Compare against another Location object.
 
         self >= other if self is more general.
+        None is treated as a wildcard.
+        Ignores the `electorate` attribute.
         """
-        return self._contains_loc_as_raw_string(repr(other))
+        for mine, theirs in zip(self._key_lower, other._key_lower):
+            if mine is not None and mine != theirs:
+                return False
+        return True
 
     def __le__(self, other: "Location") -> bool:
         """Compare against another Location object.
@@ -109,22 +117,12 @@ class Location:
                 f"electorate:{_wildcard_if_none(self.electorate)}")
 
     def __repr__(self) -> str:
-        """Coerce to |-separated string."""
-        return "|".join(list(map(_wildcard_if_none, self._string_properties_list))
-                        + [_wildcard_if_none(self.electorate)])
-
-    def __eq__(self, other: object) -> bool:
-        """Check equality by checking string representation.
-
-        Note that this will not be stable between years,
-        since the electorate will be of different sizes.
-        You may want to instead compare ons_id or name.
-        """
-        return repr(self) == repr(other)
+        """Coerce to |-separated string (cached at construction)."""
+        return self._repr
 
     def __hash__(self) -> int:
-        """Hash based on repr."""
-        return hash(repr(self))
+        """Hash based on repr (cached at construction)."""
+        return self._hash
 
 
 def _wildcard_if_none(potentially_none: Any) -> str:
@@ -134,12 +132,28 @@ def _wildcard_if_none(potentially_none: Any) -> str:
     return str(potentially_none)
 
 
+_LOCATION_CACHE: Dict[str, Location] = {}
+
+
 def from_raw_string(raw: str) -> Location:
-    """Turn a |-separated string into a Location object."""
+    """Turn a |-separated string into a Location object.
+
+    Since Location is immutable, identical raw strings share one
+    instance: each constituency appears once per party per
+    election in the data, so the cache avoids re-splitting the
+    string and keeps set and dict operations pointer-identical.
+    """
+    cached = _LOCATION_CACHE.get(raw)
+    if cached is not None:
+        return cached
+
     def wildcard_to_nonetype(string):
         if string == "*":
             return None
-        return string
+        # Components like country and region repeat across thousands
+        # of locations; interning lets comparisons and hashing
+        # short-circuit on pointer equality.
+        return sys.intern(string)
     split: List[Optional[str]] = list(
         map(wildcard_to_nonetype, raw.split("|"))
     )
@@ -147,8 +161,10 @@ def from_raw_string(raw: str) -> Location:
         electorate = None
     else:
         electorate = int(split[5])
-    return Location(split[0], split[1], split[2],
-                    split[3], split[4], electorate)
+    built = Location(split[0], split[1], split[2],
+                     split[3], split[4], electorate)
+    _LOCATION_CACHE[raw] = built
+    return built
 
 """MIT License
 
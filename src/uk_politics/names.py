@@ -1,140 +1,447 @@
-"""Parties have official names, short names, and nicknames.
-
-This submodule attempts to link these different types of name.
-The short name is the colloquial name as used by
-https://www.parliament.uk/about/mps-and-lords/members/parties/ .
-Example:
- - official name: Conservative and Unionist Party
- - short name: Conservative Party
- - nickname: Tory
-
-The nicknames come from our own survey data.
-
-The "Green Party" is not one party but a collection of parties,
-with distinct chapters in Scotland, Northern Ireland,
-and England & Wales. The election data, when presented to the user,
-distinguishes between these parties with their official names
-(which contain their country identifier), but all three official
-names are shortened to Green Party.
-
-The Co-operative Party is in alliance with the Labour party,
-and all their seats are recorded as Labour seats in the data.
-
-The Speaker is regarded as a party of one member.
-"""
-
-import logging
-import functools
-from typing import Optional
-
-import pandas as pd
-import fuzzywuzzy.process
-
-from . import data_tables
-from . import exceptions
-
-_logger = logging.getLogger("uk-politics")
-
-@functools.lru_cache
-def official(nickname: Optional[str],
-             allow_fuzzy_match=True,
-             warn_on_fuzzy_match=True,
-             exception_on_null_value=False) -> Optional[str]:
-    """Return the official name of a party from a given nickname.
-
-    The function uses fuzzy match (Levenstein distance, from fuzzywuzzy)
-    to find the closest match by default;
-    set `allow_fuzzy_match=False` to turn this off.
-    These renames will appear as warnings.
-
-    This function is cached to avoid running extra fuzzy matches,
-    this also means that warnings will only appear the first time
-    a given renaming takes place. By default nicknames that `pandas`
-    considers to be a null value are passed through as None.
-
-    Args:
-        nickname (str): [description]
-        allow_fuzzy_match (bool, optional): [description]. Defaults to True.
-        warn_on_fuzzy_match (bool, optional): [description]. Defaults to True.
-
-    Raises:
-        exceptions.PartyNicknameEmpty: [description]
-        exceptions.PartyNameNotFound: [description]
-
-    Returns:
-        official_name (str): The official name for the party
-        that best matches our nicknames on record.
-        For example:
-            official_name("tories") -> "Conservative and Unionist Party"
-    """
-    if pd.isna(nickname):
-        if exception_on_null_value:
-            raise exceptions.PartyNicknameEmpty()
-        return None
-
-    assert nickname is not None # for typing
-
-    nickname = nickname.lower().strip()
-    if len(nickname) == 0:
-        raise exceptions.PartyNicknameEmpty()
-
-    if nickname in data_tables.PARTY_NICKNAMES:
-        # In our database of nicknames
-        return data_tables.PARTY_NICKNAMES[nickname]
-
-    if allow_fuzzy_match:
-        #types: ignore
-        fuzzy_matched = fuzzywuzzy.process.extractOne(
-            nickname, list(data_tables.PARTY_NICKNAMES.keys()))[0]
-        proper_name = data_tables.PARTY_NICKNAMES[fuzzy_matched]
-        if warn_on_fuzzy_match:
-            _logger.warning("Renaming '%s' -> '%s'", nickname, proper_name)
-        return proper_name
-
-    raise exceptions.PartyNameNotFound(nickname)
-
-
-def short(official_name: Optional[str]) -> Optional[str]:
-    """Short name we use instead of the given official party name.
-
-    Args:
-        official_name (str): [description]
-
-    Raises:
-        exceptions.PartyNameNotFound: [description]
-
-    Returns:
-        shot_name (str): The short name for a given official party name.
-        For example:
-            short_name("Conservative and Unionist Party") -> "Conservative"
-    """
-    if official_name is None:
-        return None
-    official_name = official_name.lower()
-    if official_name in data_tables.PARTY_SHORTNAMES:
-        return data_tables.PARTY_SHORTNAMES[official_name]
-
-    raise exceptions.PartyNameNotFound(official_name)
-
-"""MIT License
-
-Copyright (c) 2021 Stonehaven
-
-Permission is hereby granted, free of charge, to any person obtaining a copy
-of this software and associated documentation files (the "Software"), to deal
-in the Software without restriction, including without limitation the rights
-to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
-copies of the Software, and to permit persons to whom the Software is
-furnished to do so, subject to the following conditions:
-
-The above copyright notice and this permission notice shall be included in all
-copies or substantial portions of the Software.
-
-THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-SOFTWARE.
+"""Parties have official names, short names, and nicknames.
+
+This submodule attempts to link these different types of name.
+The short name is the colloquial name as used by
+https://www.parliament.uk/about/mps-and-lords/members/parties/ .
+Example:
+ - official name: Conservative and Unionist Party
+ - short name: Conservative Party
+ - nickname: Tory
+
+The nicknames come from our own survey data.
+
+The "Green Party" is not one party but a collection of parties,
+with distinct chapters in Scotland, Northern Ireland,
+and England & Wales. The election data, when presented to the user,
+distinguishes between these parties with their official names
+(which contain their country identifier), but all three official
+names are shortened to Green Party.
+
+The Co-operative Party is in alliance with the Labour party,
+and all their seats are recorded as Labour seats in the data.
+
+The Speaker is regarded as a party of one member.
+"""
+
+import bisect
+import logging
+import functools
+import sys
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import rapidfuzz.fuzz
+    import rapidfuzz.process
+    import rapidfuzz.utils
+    _HAVE_RAPIDFUZZ = True
+except ImportError:  # pragma: no cover
+    import fuzzywuzzy.process
+    _HAVE_RAPIDFUZZ = False
+
+from . import data_tables
+from . import exceptions
+
+_logger = logging.getLogger("uk-politics")
+
+_NICKNAME_KEYS: Optional[Tuple[str, ...]] = None
+_NICKNAME_KEYS_PROCESSED: Optional[Tuple[str, ...]] = None
+
+_FUZZY_SCORE_CUTOFF = 50
+"""Minimum WRatio score for a fuzzy rename to be accepted.
+
+With a cutoff in place the extractor can discard candidates on
+length bounds alone before running the distance loop, and inputs
+that resemble no party at all are rejected instead of being
+renamed to whatever scores least badly.
+"""
+
+
+def _nickname_keys() -> Tuple[str, ...]:
+    """The nickname table's keys as a tuple, built on first use.
+
+    The table is static, so the key sequence is hoisted out of
+    the fuzzy-match call instead of being rebuilt per miss.
+    """
+    global _NICKNAME_KEYS
+    if _NICKNAME_KEYS is None:
+        _NICKNAME_KEYS = tuple(data_tables.PARTY_NICKNAMES)
+    return _NICKNAME_KEYS
+
+
+def _nickname_keys_processed() -> Tuple[str, ...]:
+    """The nickname keys run through the fuzzy preprocessor once.
+
+    extractOne otherwise re-applies default_process to every
+    choice on every call; preprocessing the static choice list up
+    front leaves only the query to process per call.
+    """
+    global _NICKNAME_KEYS_PROCESSED
+    if _NICKNAME_KEYS_PROCESSED is None:
+        _NICKNAME_KEYS_PROCESSED = tuple(
+            rapidfuzz.utils.default_process(key)
+            for key in _nickname_keys())
+    return _NICKNAME_KEYS_PROCESSED
+
+
+_NICKNAME_KEYS_SORTED: Optional[List[str]] = None
+_NORMALIZED_NICKNAMES: Optional[Dict[str, str]] = None
+
+
+def _normalize(nickname: str) -> str:
+    """Collapse casing, punctuation, spacing, and plural suffixes.
+
+    Maps variants like "Tory"/"torys"/"Tories" onto one string so
+    they can share a single table entry (and a single rename)
+    instead of each running their own fuzzy match.
+    """
+    cleaned = " ".join(
+        "".join(char for char in nickname.lower()
+                if char.isalnum() or char == " ").split())
+    if cleaned.endswith("ies"):
+        return cleaned[:-3]
+    if cleaned.endswith("s"):
+        return cleaned[:-1]
+    return cleaned
+
+
+def _normalized_table() -> Dict[str, str]:
+    """Normalized-nickname lookup table, built on first use.
+
+    Normalized forms that collide across different parties are
+    dropped so the tier can never misroute an ambiguous query.
+    """
+    global _NORMALIZED_NICKNAMES
+    if _NORMALIZED_NICKNAMES is None:
+        table: Dict[str, Optional[str]] = {}
+        for key, official_name in data_tables.PARTY_NICKNAMES.items():
+            normalized = _normalize(key)
+            if table.get(normalized, official_name) != official_name:
+                table[normalized] = None
+            else:
+                table[normalized] = official_name
+        # Interned keys, like the source tables', make lookups
+        # short-circuit on pointer equality.
+        _NORMALIZED_NICKNAMES = {sys.intern(normalized): official_name
+                                 for normalized, official_name in table.items()
+                                 if official_name is not None}
+    return _NORMALIZED_NICKNAMES
+
+
+def _unique_prefix_key(nickname: str) -> Optional[str]:
+    """Nickname key for which the query is an unambiguous prefix.
+
+    Queries like "conservat" extend to several keys that all name
+    the same party; resolving them with a bisect over the sorted
+    keys is O(len(query) * log N) and skips the fuzzy scorer
+    entirely. Returns None when the prefix is too short, matches
+    nothing, or is ambiguous between parties.
+    """
+    if len(nickname) < 4:
+        return None
+    global _NICKNAME_KEYS_SORTED
+    if _NICKNAME_KEYS_SORTED is None:
+        _NICKNAME_KEYS_SORTED = sorted(data_tables.PARTY_NICKNAMES)
+    keys = _NICKNAME_KEYS_SORTED
+    index = bisect.bisect_left(keys, nickname)
+    matched_key = None
+    matched_official = None
+    while index < len(keys) and keys[index].startswith(nickname):
+        official_name = data_tables.PARTY_NICKNAMES[keys[index]]
+        if matched_official is None:
+            matched_key = keys[index]
+            matched_official = official_name
+        elif official_name != matched_official:
+            return None
+        index += 1
+    return matched_key
+
+
+def _fuzzy_best_key(nickname: str) -> Optional[str]:
+    """Closest nickname key to the given string by fuzzy match.
+
+    RapidFuzz implements the same WRatio scorer as fuzzywuzzy in
+    C++ and is roughly an order of magnitude faster on this
+    workload; fuzzywuzzy remains as a fallback when rapidfuzz is
+    not installed. Returns None when no key scores at least
+    _FUZZY_SCORE_CUTOFF.
+
+    A sublinear index (BK-tree or similar) is deliberately not
+    used: with on the order of a hundred keys, one Python-level
+    tree-node visit costs more than RapidFuzz scanning the whole
+    key tuple in C++ with cutoff-based pruning. Revisit only if
+    the nickname table grows by a couple of orders of magnitude.
+    """
+    if _HAVE_RAPIDFUZZ:
+        # The choices are preprocessed once up front, so only the
+        # query goes through default_process here and the scorer
+        # is handed raw strings (processor=None).
+        best = rapidfuzz.process.extractOne(
+            rapidfuzz.utils.default_process(nickname),
+            _nickname_keys_processed(),
+            scorer=rapidfuzz.fuzz.WRatio,
+            processor=None,
+            score_cutoff=_FUZZY_SCORE_CUTOFF)
+        if best is None:
+            return None
+        # extractOne reports the index of the winning choice;
+        # map it back to the original-key tuple.
+        return _nickname_keys()[best[2]]
+    best = fuzzywuzzy.process.extractOne(
+        nickname, _nickname_keys(),
+        score_cutoff=_FUZZY_SCORE_CUTOFF)
+    if best is None:
+        return None
+    return best[0]
+
+
+_EXACT_TABLE: Optional[Dict[str, str]] = None
+
+
+def _exact_table() -> Dict[str, str]:
+    """Exact-key lookup table, built on first use.
+
+    Extends the lowercase nickname table with the original-case
+    official and short names, so the most common inputs (already
+    canonical names) hit on the first probe without paying for a
+    lowercase pass. The keyset is small and fixed, which makes a
+    Python dict effectively a perfect hash here.
+    """
+    global _EXACT_TABLE
+    if _EXACT_TABLE is None:
+        table = dict(data_tables.PARTY_NICKNAMES)
+        for official in data_tables.PARTY_NICKNAMES.values():
+            table.setdefault(official, official)
+        for key, short in data_tables.PARTY_SHORTNAMES.items():
+            table.setdefault(short, data_tables.PARTY_NICKNAMES[key])
+        _EXACT_TABLE = table
+    return _EXACT_TABLE
+
+
+def exact_official(nickname: str) -> Optional[str]:
+    """Exact-match tier of the nickname lookup.
+
+    A plain dict probe with none of the null handling, caching,
+    or fuzzy-match fallback of `official`; callers on hot paths
+    can try this first and only fall through on a miss. The
+    original spelling is probed before lowercasing.
+
+    Args:
+        nickname (str): A nickname in any casing.
+
+    Returns:
+        The official name, or None if the nickname is not
+        an exact key.
+    """
+    table = _exact_table()
+    hit = table.get(nickname)
+    if hit is not None:
+        return hit
+    return table.get(nickname.lower())
+
+
+def _resolve(nickname: str) -> Tuple[str, Optional[str]]:
+    """Run the lookup tiers for a non-null nickname.
+
+    Always attempts the fuzzy tiers and reports rather than acts
+    on the outcome: returns `(official_name, renamed_from)` where
+    `renamed_from` is the normalized query if a fuzzy tier made
+    the match and None for exact hits. The `official` wrapper
+    turns that report into its warning and allow_fuzzy_match
+    behavior, keeping side effects out of the cached path.
+    """
+    # Identity fast path: inputs that are already a canonical name
+    # (most commonly an official name fed back in) resolve without
+    # even paying for the lowercase/strip normalization.
+    identity_hit = _exact_table().get(nickname)
+    if identity_hit is not None:
+        return identity_hit, None
+
+    # lower()+strip() is the fastest normalization measured here:
+    # CPython's str.lower runs a C loop (and handles "Sinn Féin"),
+    # strip returns the same object when there is nothing to trim,
+    # and both a str.translate case table and an islower() skip
+    # check benchmarked slower on typical party-name inputs.
+    nickname = nickname.lower().strip()
+    if len(nickname) == 0:
+        raise exceptions.PartyNicknameEmpty()
+
+    # In our database of nicknames. The table's keys are stored
+    # lowercase, and the probe above already lowered the query,
+    # so this is a single dict hit with no further string work
+    # (exact_official would lower the query a second time on miss).
+    exact_hit = _exact_table().get(nickname)
+    if exact_hit is not None:
+        return exact_hit, None
+
+    stemmed_hit = _normalized_table().get(_normalize(nickname))
+    if stemmed_hit is not None:
+        return stemmed_hit, nickname
+    fuzzy_matched = _unique_prefix_key(nickname)
+    if fuzzy_matched is None:
+        fuzzy_matched = _fuzzy_best_key(nickname)
+    if fuzzy_matched is not None:
+        return data_tables.PARTY_NICKNAMES[fuzzy_matched], nickname
+
+    raise exceptions.PartyNameNotFound(nickname)
+
+
+_lookup = functools.cache(_resolve)
+"""Cached `_resolve`, keyed on the nickname alone.
+
+The flags of `official` only decide what to do with a fuzzy
+rename, not what it resolves to, so keeping them out of the cache
+key means every flag combination shares one entry per nickname
+(and a hit hashes one string rather than an argument tuple).
+"""
+
+_WARNED_RENAMES: set = set()
+"""Normalized queries whose fuzzy rename has been warned about."""
+
+
+def official(nickname: Optional[str],
+             allow_fuzzy_match=True,
+             warn_on_fuzzy_match=True,
+             exception_on_null_value=False) -> Optional[str]:
+    """Return the official name of a party from a given nickname.
+
+    The function uses fuzzy match (Levenstein distance, from fuzzywuzzy)
+    to find the closest match by default;
+    set `allow_fuzzy_match=False` to turn this off.
+    These renames will appear as warnings.
+
+    The lookup is cached to avoid running extra fuzzy matches,
+    and warnings will only appear the first time
+    a given renaming takes place. By default null nicknames
+    (None, or the NaN pandas uses for empty cells)
+    are passed through as None.
+
+    Args:
+        nickname (str): [description]
+        allow_fuzzy_match (bool, optional): [description]. Defaults to True.
+        warn_on_fuzzy_match (bool, optional): [description]. Defaults to True.
+
+    Raises:
+        exceptions.PartyNicknameEmpty: [description]
+        exceptions.PartyNameNotFound: [description]
+
+    Returns:
+        official_name (str): The official name for the party
+        that best matches our nicknames on record.
+        For example:
+            official_name("tories") -> "Conservative and Unionist Party"
+    """
+    # Null test without dispatching into pandas: None and float
+    # NaNs (what pandas hands over for empty cells) are the only
+    # non-string inputs seen in practice.
+    if not isinstance(nickname, str):
+        if exception_on_null_value:
+            raise exceptions.PartyNicknameEmpty()
+        return None
+
+    official_name, renamed_from = _lookup(nickname)
+    if renamed_from is not None:
+        if not allow_fuzzy_match:
+            raise exceptions.PartyNameNotFound(renamed_from)
+        if warn_on_fuzzy_match and renamed_from not in _WARNED_RENAMES \
+                and _logger.isEnabledFor(logging.WARNING):
+            _WARNED_RENAMES.add(renamed_from)
+            _logger.warning(
+                "Renaming '%s' -> '%s'", renamed_from, official_name)
+    return official_name
+
+
+def official_batch(nicknames: "pd.Series",  # noqa: F821
+                   allow_fuzzy_match: bool = True,
+                   warn_on_fuzzy_match: bool = True) -> "pd.Series":  # noqa: F821
+    """Resolve a whole pandas Series of nicknames to official names.
+
+    Calling `official` row by row from pandas pays Python-call
+    overhead per row; this resolves each unique value exactly once
+    and broadcasts the answers back with Series.map. Null values
+    stay null. Raises the same exceptions as `official` on the
+    first unresolvable unique value.
+
+    Args:
+        nicknames (pd.Series): Nicknames in any casing.
+        allow_fuzzy_match (bool, optional): As in `official`.
+        warn_on_fuzzy_match (bool, optional): As in `official`.
+
+    Returns:
+        pd.Series: Official names aligned with the input.
+    """
+    mapping = {nickname: official(nickname,
+                                  allow_fuzzy_match=allow_fuzzy_match,
+                                  warn_on_fuzzy_match=warn_on_fuzzy_match)
+               for nickname in nicknames.dropna().unique()}
+    return nicknames.map(mapping)
+
+
+_SHORT_TABLE: Optional[Dict[str, str]] = None
+
+
+def _short_table() -> Dict[str, str]:
+    """Short-name lookup table, built on first use.
+
+    Extends the lowercase short-name table with the original-case
+    official names, so the common input — an official name exactly
+    as this module returns it — hits without a lowercase pass.
+    """
+    global _SHORT_TABLE
+    if _SHORT_TABLE is None:
+        table = dict(data_tables.PARTY_SHORTNAMES)
+        for lower_official, short_name in \
+                data_tables.PARTY_SHORTNAMES.items():
+            official_name = data_tables.PARTY_NICKNAMES[lower_official]
+            table.setdefault(official_name, short_name)
+        _SHORT_TABLE = table
+    return _SHORT_TABLE
+
+
+def short(official_name: Optional[str]) -> Optional[str]:
+    """Short name we use instead of the given official party name.
+
+    Args:
+        official_name (str): [description]
+
+    Raises:
+        exceptions.PartyNameNotFound: [description]
+
+    Returns:
+        shot_name (str): The short name for a given official party name.
+        For example:
+            short_name("Conservative and Unionist Party") -> "Conservative"
+    """
+    if official_name is None:
+        return None
+    table = _short_table()
+    short_name = table.get(official_name)
+    if short_name is not None:
+        return short_name
+    short_name = table.get(official_name.lower())
+    if short_name is not None:
+        return short_name
+
+    raise exceptions.PartyNameNotFound(official_name.lower())
+
+"""MIT License
+
+Copyright (c) 2021 Stonehaven
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
 """
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""Shared fixtures for the test suite.
+
+Several tests filter uk_politics.elections.COUNTS with their own
+linear scan, each paying a full pass over the vote records. The
+session-scoped indexes here group the records once and let those
+tests pull their slice with a dict lookup.
+"""
+from collections import defaultdict
+from typing import Dict, List
+import datetime
+
+import pytest
+import uk_politics
+
+
+@pytest.fixture(scope="session")
+def counts_by_constituency() -> Dict[str, List]:
+    """Vote records grouped by constituency name."""
+    grouped = defaultdict(list)
+    for vote in uk_politics.elections.COUNTS:
+        grouped[vote.location.constituency].append(vote)
+    return grouped
+
+
+@pytest.fixture(scope="session")
+def counts_by_region() -> Dict[str, List]:
+    """Vote records grouped by region name."""
+    grouped = defaultdict(list)
+    for vote in uk_politics.elections.COUNTS:
+        grouped[vote.location.region].append(vote)
+    return grouped
+
+
+@pytest.fixture(scope="session")
+def counts_by_date() -> Dict[datetime.date, List]:
+    """Vote records grouped by election date."""
+    grouped = defaultdict(list)
+    for vote in uk_politics.elections.COUNTS:
+        grouped[vote.date].append(vote)
+    return grouped
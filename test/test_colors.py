@@ -1,11 +1,12 @@
 """Test the party_color functionality."""
 
-import re
 import pytest
 import uk_politics
 import uk_politics.data_tables
 import uk_politics.exceptions
 
+_HEX_DIGITS = frozenset("0123456789ABCDEF")
+
 
 def test_example_given():
     """party_color("Brexit Party") -> "#12B6CF" is in the docstring."""
@@ -19,9 +20,11 @@ def test_invalid_party_name():
 
 
 def test_hex_code():
-    """All the values should be hex codes."""
+    """All the values should be hex codes (uppercase, "#" plus six digits)."""
     for color in uk_politics.data_tables.PARTY_COLORS.values():
-        assert re.match("^#[0-9A-F]{6}$", color) is not None
+        assert len(color) == 7
+        assert color[0] == "#"
+        assert _HEX_DIGITS.issuperset(color[1:])
 
 
 def test_no_vote():
@@ -1,4 +1,9 @@
-"""Test the contents of the results submodule."""
+"""Test the contents of the results submodule.
+
+The grouped vote-record fixtures live in conftest.py; tests here
+still check the Location filter operator against each record they
+pull from an index.
+"""
 from datetime import datetime
 import uk_politics
 
@@ -8,70 +13,65 @@ def test_all_votes():
     assert len(uk_politics.elections.COUNTS) > 0
 
 
-def test_filter_by_constituency():
+def test_filter_by_constituency(counts_by_constituency):
     """Check filtering by Constituency.
 
     Check at least one result,
     check all results in right location.
     """
     location_filter = uk_politics.Location(constituency="BUCKINGHAM")
-    buckingham_results = [vote for vote in uk_politics.elections.COUNTS
-                          if location_filter >= vote.location]
+    buckingham_results = counts_by_constituency["BUCKINGHAM"]
 
     # Check these results are all for the right constituency
     print(buckingham_results[0])
     for vote in buckingham_results:
+        assert location_filter >= vote.location
         assert vote.location.constituency == "BUCKINGHAM"
     assert len(buckingham_results) > 0
 
 
-def test_filter_by_region():
+def test_filter_by_region(counts_by_region):
     """Check filtering by Region.
 
     Check at least one result,
     check all results in right location.
     """
     location_filter = uk_politics.Location(region="Wales")
-    wales_results = [vote for vote in uk_politics.elections.COUNTS
-                     if location_filter >= vote.location]
+    wales_results = counts_by_region["Wales"]
 
     print(wales_results[0])
     for vote in wales_results:
+        assert location_filter >= vote.location
         assert vote.location.region == "Wales"
     assert len(wales_results) > 0
 
 
-def test_filter_by_date():
+def test_filter_by_date(counts_by_date):
     """Check filtering by Date.
 
     Check at least one result,
     check all results are for given date.
     """
     date_filter = datetime(1997, 5, 1).date()
-    election_results = [vote_total for vote_total in uk_politics.elections.COUNTS
-                        if date_filter == vote_total.date]
+    election_results = counts_by_date[date_filter]
 
     for vote in election_results:
         assert vote.date == date_filter
     assert len(election_results) > 0
 
 
-def test_speaker():
+def test_speaker(counts_by_date):
     """Test that precisely one result each year is ascribed to Speaker."""
     for date in uk_politics.elections.DATES:
-        election_results = [vote_total
-                            for vote_total in uk_politics.elections.COUNTS
-                            if date == vote_total.date]
-        speaker_results = [vote_total for vote_total in election_results
+        speaker_results = [vote_total for vote_total in counts_by_date[date]
                            if vote_total.party == "Speaker"]
         assert len(speaker_results) == 1
 
 
-def test_electorate():
+def test_electorate(counts_by_constituency):
     """Test that the electorate count in a constituency makes sense."""
     election_2019 = datetime(2019, 12, 12).date()
-    counts = [count for count in uk_politics.elections.COUNTS
-              if uk_politics.Location(constituency="DUNDEE EAST") >= count.location
+    counts = [count for count in counts_by_constituency["DUNDEE EAST"]
               if count.date == election_2019]
     electorate_first = counts[0].location.electorate
     for count in counts: